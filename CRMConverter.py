@@ -0,0 +1,157 @@
+from typing import *
+from datetime import datetime
+import argparse
+import glob
+import json
+import os
+import sys
+
+# Selenium, jsonpickle and the browser classes are imported inside the commands that need them,
+# so archive commands (export, verify, stats) start without loading any of it.
+
+COMPLETE_DOWNLOADS = "Complete Downloads"
+IN_PROGRESS_DOWNLOADS = "In Progress Downloads"
+
+
+def LoadSettings(settingsPath: str) -> dict:
+    with open(settingsPath, 'r') as file:
+        return json.load(file)
+
+def LoadManifest(settings: dict):
+    from RunManifest import RunManifest
+
+    manifestPath = settings.get('manifestPath', "Run Manifest.json")
+    if not os.path.exists(manifestPath):
+        return None
+    return RunManifest(
+        manifestPath,
+        datetime.strptime(settings['startDate'], "%Y-%m-%d").date(),
+        datetime.strptime(settings['endDate'], "%Y-%m-%d").date(),
+        settings.get('maxAttempts', 3),
+    )
+
+def LoadArchive(directory: str) -> Dict[str, list]:
+    import jsonpickle
+
+    archive = {}
+    for path in sorted(glob.glob(os.path.join(directory, "* Download.json"))):
+        with open(path, "r") as file:
+            archive[os.path.basename(path)] = jsonpickle.decode(file.read())
+    return archive
+
+
+def Download(args) -> int:
+    from EZVetDownloader import EZVetDownloader
+
+    with EZVetDownloader(args.settings) as converter:
+        converter.StartConversion()
+    return 0
+
+def Upload(args) -> int:
+    from CovetrusUploader import CovetrusUploader
+
+    # Only logging in is automated so far, the import itself is still done by hand in the
+    # browser, so keep the session open until the user says they're finished
+    with CovetrusUploader(args.settings) as uploader:
+        uploader.LogIn()
+        try:
+            input("Logged into Covetrus. Finish the import in the browser, then press Enter to close it...")
+        except (KeyboardInterrupt, EOFError):
+            # Ctrl+C / Ctrl+D just means "done" here, let __exit__ close the browser instead of leaving it for debugging
+            print()
+    return 0
+
+def Export(args) -> int:
+    archive = LoadArchive(COMPLETE_DOWNLOADS)
+    appointments = [appointment for day in archive.values() for appointment in day]
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            # Dates and times as ISO strings, nested models as plain objects
+            json.dump(appointments, output, indent=2, default=lambda o: o.isoformat() if hasattr(o, "isoformat") else vars(o))
+        else:
+            import csv
+            columns = ["appointmentDate", "appointmentTime", "clientName", "petName", "doctor", "type", "reason",
+                       "weight", "heartRate", "bodyConditionScore", "historyText", "physicalExamText", "assessmentText", "planText"]
+            writer = csv.writer(output)
+            writer.writerow(columns + ["medications", "theraputicProcedures", "diagnosticResults"])
+            for appointment in appointments:
+                writer.writerow([getattr(appointment, column, None) for column in columns] + [
+                    "; ".join(m.name for m in appointment.medications if m.name),
+                    "; ".join(p.name for p in appointment.theraputicProcedures if p.name),
+                    len(appointment.diagnosticResults),
+                ])
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"Exported {len(appointments)} appointment(s) from {len(archive)} day(s)", file=sys.stderr)
+    return 0
+
+def Verify(args) -> int:
+    from RunManifest import RunManifest, AppointmentState
+
+    settings = LoadSettings(args.settings)
+    manifest = LoadManifest(settings)
+    listed = LoadArchive(IN_PROGRESS_DOWNLOADS)
+    complete = LoadArchive(COMPLETE_DOWNLOADS)
+
+    problems = []
+    for fileName, appointments in listed.items():
+        filled = complete.get(fileName, [])
+        for appointment in appointments:
+            if appointment not in filled:
+                problems.append(f"{fileName}: {appointment.petName} at {appointment.appointmentTime} was listed but never filled")
+    for fileName, appointments in complete.items():
+        filledKeys = set()
+        for appointment in appointments:
+            filledKeys.add(RunManifest.AppointmentKey(appointment))
+            if not appointment.IsFullyFilled():
+                problems.append(f"{fileName}: {appointment.petName} at {appointment.appointmentTime} is missing basic info")
+        # The manifest and the archive should agree on what was filled
+        if manifest is not None:
+            day = manifest.days.get(fileName[:-len(" Download.json")])
+            for key, entry in (day["appointments"].items() if day is not None else []):
+                if entry["state"] == AppointmentState.FILLED and key not in filledKeys:
+                    problems.append(f"{fileName}: manifest marks {key} filled but it is not in the archive")
+
+    for problem in problems:
+        print(problem)
+    print(f"Checked {sum(len(a) for a in complete.values())} appointment(s) in {len(complete)} day(s): {len(problems)} problem(s)", file=sys.stderr)
+    return 1 if len(problems) > 0 else 0
+
+def Stats(args) -> int:
+    settings = LoadSettings(args.settings)
+    manifest = LoadManifest(settings)
+    if manifest is None:
+        print("No run manifest found, nothing has been downloaded yet")
+        return 0
+
+    counts = manifest.Counts()
+    print(f"Range:         {settings['startDate']} to {settings['endDate']}")
+    print(f"Days:          {counts['daysComplete']}/{counts['days']} complete, {counts['daysFailed']} failed")
+    print(f"Appointments:  {counts['filled']}/{counts['listed']} filled, {counts['failed']} failed, {counts['retried']} retried")
+    print(f"Remaining:     {len(manifest.RemainingDays())} day(s)")
+    return 0
+
+
+def Main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert ezVet records for import into Covetrus")
+    parser.add_argument("--settings", default="settings.json", help="Path to settings.json")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("download", help="Download appointments from ezVet (starts Chrome)").set_defaults(handler=Download)
+    subparsers.add_parser("upload", help="Log into Covetrus for upload (starts Chrome)").set_defaults(handler=Upload)
+    exportParser = subparsers.add_parser("export", help="Export downloaded appointments")
+    exportParser.add_argument("--format", choices=["csv", "json"], default="csv")
+    exportParser.add_argument("--output", help="File to write to, stdout if omitted")
+    exportParser.set_defaults(handler=Export)
+    subparsers.add_parser("verify", help="Check the download archive against the run manifest").set_defaults(handler=Verify)
+    subparsers.add_parser("stats", help="Show progress of the current run").set_defaults(handler=Stats)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(Main())
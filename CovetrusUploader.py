@@ -7,9 +7,12 @@ from selenium.webdriver.support import expected_conditions as EC
 import json
 import logging
 
+# Local Imports
+from Metrics import Metrics
+
 
 class CovetrusUploader:
-    def __init__(self, settingsPath: str):
+    def __init__(self, settingsPath: str, metrics: Metrics = None, workerName: str = "0"):
         logging.basicConfig(filename='EZVetDownloader.log', )
         self.logger = logging.getLogger('EZVetDownloader')
 
@@ -19,34 +22,67 @@ class CovetrusUploader:
             self.covetrusUser = settings['covetrus']['username']
             self.covetrusPass = settings['covetrus']['password']
             self.covetrusUrl = settings['covetrus']['url']
+            metricsPort = settings.get('metricsPort')
         self.logger.info(f"""Loaded settings from {settingsPath}:
             User: {self.covetrusUser}
             Password: {'*' * len(self.covetrusPass)}
             URL: {self.covetrusUrl}
         """)
 
-        self.webDriver = webdriver.Chrome()
-        self.webDriver.get(self.covetrusUrl)
-        self.webDriver.maximize_window()
-        self.awaiter = WebDriverWait(self.webDriver, 10)
+        # Metrics are always collected, the HTTP endpoint is only started when a port is configured
+        self.workerName = workerName
+        self.metrics = metrics if metrics is not None else Metrics()
+        if metrics is None and metricsPort is not None:
+            self.metrics.StartServer(metricsPort)
+            self.logger.info(f"Serving metrics on http://127.0.0.1:{metricsPort}/metrics")
 
+        # The web driver is started on first use so commands that never touch Covetrus don't launch Chrome
+        self._webDriver = None
+        self._awaiter = None
 
-        def __enter__(self):
+    def StartBrowser(self):
+        if self._webDriver is not None:
             return self
-        def __exit__(self, excType, excValue, traceback):
-            if (excType is not None):
-                self.logger.error(f"An exception occurred on date {self.CurrentDate} for Patient {self.CureentPatient} belonging to {self.CurrentOwner}: {excValue}\n{traceback}")
-            else:
-                # Close the web driver when done (leave open if error to allow debugging)
-                self.driver.quit()
-                self.logger.info("Closed all web driver windows successfully.")
-            logging.shutdown()
-
-        def LogIn(self):
-            self.logger.info("Checking for login page...")
-            if "u/login" in self.webDriver.current_url:
-                self.logger.info("Logging into covetrus...")
-                
+
+        driver = webdriver.Chrome()
+        try:
+            self.metrics.InstrumentWebDriver(driver, self.workerName)
+            driver.get(self.covetrusUrl)
+            driver.maximize_window()
+        except BaseException:
+            # Never leave a half-started browser behind for the next caller to pick up
+            driver.quit()
+            raise
+        self._webDriver = driver
+        self._awaiter = WebDriverWait(driver, 10)
+        return self
+
+    @property
+    def webDriver(self):
+        return self.StartBrowser()._webDriver
+
+    @property
+    def awaiter(self):
+        return self.StartBrowser()._awaiter
+
+    def __enter__(self):
+        return self
+    def __exit__(self, excType, excValue, traceback):
+        if (excType is not None):
+            self.logger.error(f"An exception occurred while uploading to Covetrus: {excValue}\n{traceback}")
+        elif self._webDriver is not None:
+            # Close the web driver when done (leave open if error to allow debugging)
+            self._webDriver.quit()
+            self.logger.info("Closed all web driver windows successfully.")
+        self.metrics.StopServer()
+        logging.shutdown()
+
+    def LogIn(self):
+        self.logger.info("Checking for login page...")
+        if "u/login" in self.webDriver.current_url:
+            self.logger.info("Logging into covetrus...")
+
+            with self.metrics.Time("step_duration_seconds", step="covetrus_login"):
                 loginForm = self.webDriver.find_element(By.ID, "widget-auth0-container")
                 covetrusUsernameField = loginForm.find_element(By.ID, "username")
                 covetrusPasswordField = loginForm.find_element(By.ID, "password")
@@ -55,6 +91,7 @@ class CovetrusUploader:
                 covetrusUsernameField.send_keys(self.covetrusUser)
                 covetrusPasswordField.send_keys(self.covetrusPass)
                 covetrusLoginButton.click()
-                self.logger.info("covetrus login submitted.")
-            else:
-                self.logger.info("Already logged into ezcovetrus.")
\ No newline at end of file
+            self.logger.info("covetrus login submitted.")
+        else:
+            self.logger.info("Already logged into ezcovetrus.")
+        self.metrics.RecordBrowserMemory(self.webDriver, self.workerName)
@@ -5,6 +5,7 @@ from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
+from concurrent.futures import ThreadPoolExecutor
 import json
 import jsonpickle
 from datetime import date, datetime
@@ -15,11 +16,16 @@ import traceback
 
 # Local Imports
 from AppointmentModel import AppointmentModel, DiagnosticResultModel, DiagnosticResultSpecificsModel, MedicationModel, TheraputicProcedureModel
+from Metrics import Metrics
+from RunManifest import RunManifest
+from Sections import SECTION_ROWS, SECTION_READY_MARKERS, CLINICAL_EXAM_SECTIONS, DIAGNOSTICS_AND_TREATMENTS_SECTIONS
+import Sections
 from Utils import Utils
+from WorkScheduler import WorkScheduler
 
 
 class EZVetDownloader:
-    def __init__(self, settingsPath: str):
+    def __init__(self, settingsPath: str, metrics: Metrics = None, workerName: str = "0", manifest: RunManifest = None):
         # Initialize logger
         logging.basicConfig(filename='EZVetDownloader.log', level=logging.INFO)
         self.logger = logging.getLogger('EZVetDownloader')
@@ -32,6 +38,11 @@ class EZVetDownloader:
             self.url = settings['ezVet']['url']
             self.CurrentDate = datetime.strptime(settings['startDate'], "%Y-%m-%d").date()
             self.EndDate = datetime.strptime(settings['endDate'], "%Y-%m-%d").date()
+            manifestPath = settings.get('manifestPath', "Run Manifest.json")
+            maxAttempts = settings.get('maxAttempts', 3)
+            metricsPort = settings.get('metricsPort')
+            self.workerCount = max(1, settings.get('workers', 1))
+            self.sections = Sections.ParseSections(settings.get('sections'), settingsPath)
 
             self.logger.info(f"""Loaded settings from {settingsPath}:
                 User: {self.user}
@@ -39,18 +50,55 @@ class EZVetDownloader:
                 URL: {self.url}
             """)
 
-        # Initialize the web driver (will be passed to all classes)
-        self.webDriver = webdriver.Chrome()
-        self.webDriver.get(self.url)
-        self.webDriver.maximize_window()
-        self.awaiter = WebDriverWait(self.webDriver, 10)
+        # Tracks per-day and per-appointment progress so an interrupted run resumes where it stopped
+        self.settingsPath = settingsPath
+        self.manifest = manifest if manifest is not None else RunManifest(manifestPath, self.CurrentDate, self.EndDate, maxAttempts)
+
+        # Metrics are always collected, the HTTP endpoint is only started when a port is configured
+        self.workerName = workerName
+        self.metrics = metrics if metrics is not None else Metrics()
+        if metrics is None and metricsPort is not None:
+            self.metrics.StartServer(metricsPort)
+            self.logger.info(f"Serving metrics on http://127.0.0.1:{metricsPort}/metrics")
 
-        self.LogIn()
+        # The web driver is started on first use so commands that never touch ezVet don't launch Chrome
+        self._webDriver = None
+        self._awaiter = None
 
         # Init global variables 
         self.CurrentOwner = None
         self.CureentPatient = None
         self._cachedActiveTab = None
+
+    def StartBrowser(self):
+        if self._webDriver is not None:
+            return self
+        
+        # Initialize the web driver (will be passed to all classes)
+        driver = webdriver.Chrome()
+        try:
+            self.metrics.InstrumentWebDriver(driver, self.workerName)
+            driver.get(self.url)
+            driver.maximize_window()
+            # LogIn goes through the webDriver property, so the driver has to be visible while it runs
+            self._webDriver = driver
+            self._awaiter = WebDriverWait(driver, 10)
+            self.LogIn()
+        except BaseException:
+            # Never leave a half-started, logged-out browser behind for the next caller to pick up
+            self._webDriver = None
+            self._awaiter = None
+            driver.quit()
+            raise
+        return self
+
+    @property
+    def webDriver(self):
+        return self.StartBrowser()._webDriver
+
+    @property
+    def awaiter(self):
+        return self.StartBrowser()._awaiter
     
     def GetActiveTab(self):
         if self._cachedActiveTab is None or EC.staleness_of(self._cachedActiveTab):
@@ -64,10 +112,11 @@ class EZVetDownloader:
     def __exit__(self, excType, excValue, traceback):
         if (excType is not None):
             self.logger.error(f"An exception occurred on date {self.CurrentDate} for Patient {self.CureentPatient} belonging to {self.CurrentOwner}: {excValue}\n{traceback}")
-        else:
+        elif self._webDriver is not None:
             # Close the web driver when done (leave open if error to allow debugging)
-            self.webDriver.quit()
+            self._webDriver.quit()
             self.logger.info("Closed web driver window successfully.")
+        self.metrics.StopServer()
         logging.shutdown()
 
     def LogIn(self):
@@ -133,6 +182,8 @@ class EZVetDownloader:
         # Select the day
         tries = 0
         while tries < 5:
+            if tries > 0:
+                self.metrics.Increment("retries_total", operation="goto_day", worker=self.workerName)
             shownDate = self.GetActiveTab().find_element(By.CSS_SELECTOR, "#currentdate > .current-day-active").text.strip().lower()
             expectedDate = toDate.strftime("%a, %d %b %Y").lower()
             if (shownDate == expectedDate):
@@ -188,6 +239,7 @@ class EZVetDownloader:
                     break
                 except:
                     hoverTries += 1
+                    self.metrics.Increment("retries_total", operation="hover_appointment", worker=self.workerName)
                     time.sleep(0.5)
                     if (hoverTries >= 5):
                         raise Exception(f"Could not hover over appointment on {getDate} with text '{appointmentElement.text}', skipping.")
@@ -234,13 +286,42 @@ class EZVetDownloader:
         return appointments
 
 
-    def FillClinicalExamInfo(self, appointment: AppointmentModel) -> AppointmentModel:
+    def GetSectionRows(self) -> Dict[str, Optional[List[int]]]:
+        # One round trip for every subsection: the indexes of rows that have any content, or null when
+        # the section's ready marker isn't visible yet or the list itself isn't rendered (e.g. still
+        # loading over ajax), in which case the section has to be loaded to find out
+        return self.webDriver.execute_script("""
+            const tab = arguments[0];
+            const isVisible = (element) => element !== null && element.getClientRects().length > 0;
+            const rows = {};
+            for (const [name, selector] of Object.entries(arguments[1])) {
+                const listSelector = selector.replace(/( > tbody)? > tr$/, "");
+                if (!isVisible(tab.querySelector(arguments[2][name])) || tab.querySelector(listSelector) === null) {
+                    rows[name] = null;
+                    continue;
+                }
+                rows[name] = [];
+                tab.querySelectorAll(selector).forEach((row, index) => {
+                    if (row.textContent.trim().length > 0 || row.getAttribute("data-record-title")) {
+                        rows[name].push(index);
+                    }
+                });
+            }
+            return rows;
+        """, self.GetActiveTab(), SECTION_ROWS, SECTION_READY_MARKERS)
+
+    def ShouldScrape(self, section: str, sectionRows: Dict[str, Optional[List[int]]]) -> bool:
+        return Sections.ShouldScrape(section, self.sections, sectionRows)
+
+    def FillClinicalExamInfo(self, appointment: AppointmentModel, sectionRows: Dict[str, Optional[List[int]]] = None) -> AppointmentModel:
         self.awaiter.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "div.animalMasterProblemList")))
+        if sectionRows is None:
+            sectionRows = self.GetSectionRows()
         
         #Master Problems
-        masterProblems = self.GetActiveTab().find_elements(By.CSS_SELECTOR, "div.medications > div > div > div.inputSection > div.inputSectionContent > div.animalMasterProblemList > table > tr")
+        masterProblems = self.GetActiveTab().find_elements(By.CSS_SELECTOR, SECTION_ROWS["masterProblems"]) if self.ShouldScrape("masterProblems", sectionRows) else []
         for row in masterProblems:
-            columns = masterProblems.findElements(By.CSS_SELECTOR, "td")
+            columns = row.find_elements(By.CSS_SELECTOR, "td")
             if (len(columns) <= 1):
                 continue
             dateAndTime = columns[1].text.strip().split(" ")
@@ -250,18 +331,19 @@ class EZVetDownloader:
             appointment.masterProblems.append((parsedDate, parsedTime, condition))
             
         # Health Status
-        healthStatusTable = self.GetActiveTab().find_element(By.CSS_SELECTOR, "div.HealthStatus_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div > table > tbody > tr:nth-child(1)")
-        weightString = healthStatusTable.find_element(By.CSS_SELECTOR, "td:nth-child(2)").text.strip()
-        appointment.weight = Utils.TryParse(weightString, float)
-        hrText = healthStatusTable.find_element(By.CSS_SELECTOR, "td:nth-child(4)").text.strip()
-        appointment.heartRate = Utils.TryParse(hrText, int)
-        bcs = healthStatusTable.find_element(By.CSS_SELECTOR, "td:nth-child(6)").text.strip()
-        if (bcs is not None and len(bcs) > 0):
-            appointment.bodyConditionScore = Utils.TryParse(bcs[:bcs.index("/")] if bcs.index("/") > 0 else bcs, int)
+        if self.ShouldScrape("healthStatus", sectionRows):
+            healthStatusTable = self.GetActiveTab().find_element(By.CSS_SELECTOR, f"{SECTION_ROWS['healthStatus']}:nth-child(1)")
+            weightString = healthStatusTable.find_element(By.CSS_SELECTOR, "td:nth-child(2)").text.strip()
+            appointment.weight = Utils.TryParse(weightString, float)
+            hrText = healthStatusTable.find_element(By.CSS_SELECTOR, "td:nth-child(4)").text.strip()
+            appointment.heartRate = Utils.TryParse(hrText, int)
+            bcs = healthStatusTable.find_element(By.CSS_SELECTOR, "td:nth-child(6)").text.strip()
+            if (bcs is not None and len(bcs) > 0):
+                appointment.bodyConditionScore = Utils.TryParse(bcs[:bcs.index("/")] if bcs.index("/") > 0 else bcs, int)
         
         
         #History
-        history = self.GetActiveTab().find_elements(By.CSS_SELECTOR, "div.VisitHistory_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div > table > tbody > tr")
+        history = self.GetActiveTab().find_elements(By.CSS_SELECTOR, SECTION_ROWS["history"]) if self.ShouldScrape("history", sectionRows) else []
         historyText = ""
         for row in history:
             if len(historyText) > 0:
@@ -270,7 +352,7 @@ class EZVetDownloader:
         appointment.historyText = historyText
         
         #Physical Exam
-        physExam = self.GetActiveTab().find_elements(By.CSS_SELECTOR, "div.VisitExam_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div.VisitExamList > table > tbody > tr")
+        physExam = self.GetActiveTab().find_elements(By.CSS_SELECTOR, SECTION_ROWS["physicalExam"]) if self.ShouldScrape("physicalExam", sectionRows) else []
         physExamText = ""
         for row in physExam:
             if len(physExamText) > 0:
@@ -279,7 +361,7 @@ class EZVetDownloader:
         appointment.physicalExamText = physExamText
         
         #Assessment
-        assessment = self.GetActiveTab().find_elements(By.CSS_SELECTOR, "div.ConsultAssessment_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div.ConsultAssessmentList > table > tbody > tr")
+        assessment = self.GetActiveTab().find_elements(By.CSS_SELECTOR, SECTION_ROWS["assessment"]) if self.ShouldScrape("assessment", sectionRows) else []
         assessmentText = ""
         for row in assessment:
             if len(assessmentText) > 0:
@@ -288,7 +370,7 @@ class EZVetDownloader:
         appointment.assessmentText = assessmentText
         
         #Plan
-        plan = self.GetActiveTab().find_elements(By.CSS_SELECTOR, "div.ConsultPlan_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div.ConsultPlanList > table > tbody > tr")
+        plan = self.GetActiveTab().find_elements(By.CSS_SELECTOR, SECTION_ROWS["plan"]) if self.ShouldScrape("plan", sectionRows) else []
         planText = ""
         for row in plan:
             if len(planText) > 0:
@@ -299,11 +381,13 @@ class EZVetDownloader:
         return appointment
     
     
-    def FillDiagnosticAndTreatmentInfo(self, appointment: AppointmentModel) -> AppointmentModel:
+    def FillDiagnosticAndTreatmentInfo(self, appointment: AppointmentModel, sectionRows: Dict[str, Optional[List[int]]] = None) -> AppointmentModel:
         self.awaiter.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "div.Medications_subSectionContent")))
+        if sectionRows is None:
+            sectionRows = self.GetSectionRows()
         
         #Medications
-        medications = self.GetActiveTab().find_elements(By.CSS_SELECTOR, "div.Medications_subSectionContent > div:first-child > div:first-child > div:first-child > div.inputSection > div.inputSectionContent > div.MedicationList > table > tbody > tr")
+        medications = self.GetActiveTab().find_elements(By.CSS_SELECTOR, SECTION_ROWS["medications"]) if self.ShouldScrape("medications", sectionRows) else []
         for row in medications:
             columns = row.find_elements(By.CSS_SELECTOR, "td")
             
@@ -324,7 +408,7 @@ class EZVetDownloader:
             appointment.medications.append(medication)
         
         #Theraputic Procedures
-        theraputicProcedures = self.GetActiveTab().find_elements(By.CSS_SELECTOR, "div.Therapeutics_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div.planTherapeuticsList > table > tbody > tr")
+        theraputicProcedures = self.GetActiveTab().find_elements(By.CSS_SELECTOR, SECTION_ROWS["therapeuticProcedures"]) if self.ShouldScrape("therapeuticProcedures", sectionRows) else []
         for row in theraputicProcedures:
             columns = row.find_elements(By.CSS_SELECTOR, "td")
             dateAndTime = columns[0].text.strip().split(" ")
@@ -342,9 +426,13 @@ class EZVetDownloader:
             
         
         #Diagnostic Results
-        diagnosticResults = self.GetActiveTab().find_elements(By.CSS_SELECTOR, "div.DiagnosticResults_subSectionContent > div:first-child > div.hasJaxRequest > div:nth-child(2) > div.inputSection > div.inputSectionContent > div.diagnosticResultsList > table > tbody > tr")
+        diagnosticResults = self.GetActiveTab().find_elements(By.CSS_SELECTOR, SECTION_ROWS["diagnosticResults"]) if self.ShouldScrape("diagnosticResults", sectionRows) else []
+        # Blank rows never open a popup, so don't wait out the timeout on them
+        rowsWithData = sectionRows.get("diagnosticResults")
         diagnosticRow = 1
-        for row in diagnosticResults:
+        for index, row in enumerate(diagnosticResults):
+            if rowsWithData is not None and index not in rowsWithData:
+                continue
             ActionChains(self.webDriver).double_click(row).perform()
             popupPath = "#systemWrapper > div > div.formbox > div.popup_content > form > div.popupFormInternal"
             
@@ -419,7 +507,8 @@ class EZVetDownloader:
     
         
     def FillAppointment(self, appointment: AppointmentModel) -> AppointmentModel:
-        self.GotoDay(appointment.appointmentDate)
+        with self.metrics.Time("step_duration_seconds", step="goto_day"):
+            self.GotoDay(appointment.appointmentDate)
         
         self.awaiter.until(EC.visibility_of_element_located((By.CSS_SELECTOR, appointment.cssPath)))
         
@@ -432,13 +521,27 @@ class EZVetDownloader:
         if (groupViewToggle.value_of_css_property("display") != "none"):
             groupViewToggle.find_element(By.CSS_SELECTOR, "input").click()
             
-        self.awaiter.until(EC.visibility_of_any_elements_located((By.CSS_SELECTOR, "label.ClinicalExam_sectionButton")))
-        self.GetActiveTab().find_element(By.CSS_SELECTOR, "label.ClinicalExam_sectionButton").click()
-        appointment = self.FillClinicalExamInfo(appointment)
+        # Light visits (nail trims etc.) have empty tables, so skip any section with nothing to scrape.
+        # Wait for group view to render first; sections whose ready marker isn't visible yet come back
+        # as unknown and are loaded, so an empty list is only trusted once the section has rendered
+        self.awaiter.until(EC.visibility_of_any_elements_located((By.CSS_SELECTOR, "label.ClinicalExam_sectionButton, label.DiagnosticsAndTreatments_sectionButton")))
+        sectionRows = self.GetSectionRows()
+        
+        if any(self.ShouldScrape(section, sectionRows) for section in CLINICAL_EXAM_SECTIONS):
+            self.awaiter.until(EC.visibility_of_any_elements_located((By.CSS_SELECTOR, "label.ClinicalExam_sectionButton")))
+            self.GetActiveTab().find_element(By.CSS_SELECTOR, "label.ClinicalExam_sectionButton").click()
+            with self.metrics.Time("step_duration_seconds", step="clinical_exam"):
+                appointment = self.FillClinicalExamInfo(appointment, None if any(sectionRows.get(section) is None for section in CLINICAL_EXAM_SECTIONS) else sectionRows)
+        else:
+            self.metrics.Increment("sections_skipped_total", section="clinical_exam")
         
-        self.awaiter.until(EC.visibility_of_any_elements_located((By.CSS_SELECTOR, "label.DiagnosticsAndTreatments_sectionButton")))
-        self.GetActiveTab().find_element(By.CSS_SELECTOR, "label.DiagnosticsAndTreatments_sectionButton").click()
-        appointment = self.FillDiagnosticAndTreatmentInfo(appointment)
+        if any(self.ShouldScrape(section, sectionRows) for section in DIAGNOSTICS_AND_TREATMENTS_SECTIONS):
+            self.awaiter.until(EC.visibility_of_any_elements_located((By.CSS_SELECTOR, "label.DiagnosticsAndTreatments_sectionButton")))
+            self.GetActiveTab().find_element(By.CSS_SELECTOR, "label.DiagnosticsAndTreatments_sectionButton").click()
+            with self.metrics.Time("step_duration_seconds", step="diagnostics_and_treatments"):
+                appointment = self.FillDiagnosticAndTreatmentInfo(appointment, None if any(sectionRows.get(section) is None for section in DIAGNOSTICS_AND_TREATMENTS_SECTIONS) else sectionRows)
+        else:
+            self.metrics.Increment("sections_skipped_total", section="diagnostics_and_treatments")
         
         
         
@@ -454,27 +557,44 @@ class EZVetDownloader:
             with open(f"In Progress Downloads/{saveFileName}", "r") as file:
                 appointments = jsonpickle.decode(file.read())
         else:
-            appointments = self.GetAppointments(self.CurrentDate)
+            with self.metrics.Time("step_duration_seconds", step="get_appointments"):
+                appointments = self.GetAppointments(self.CurrentDate)
+            self.metrics.Increment("appointments_listed_total", len(appointments), worker=self.workerName)
             
-            with open(f"In Progress Downloads/{saveFileName}", "w") as file:
-                file.write(jsonpickle.encode(appointments))
+            Utils.WriteFileAtomic(f"In Progress Downloads/{saveFileName}", jsonpickle.encode(appointments))
+        self.manifest.MarkDayListed(self.CurrentDate, appointments)
         
         filledAppointments = []
         if (os.path.exists(f"Complete Downloads/{saveFileName}")):
             with open(f"Complete Downloads/{saveFileName}", "r") as file:
                 filledAppointments = jsonpickle.decode(file.read())
+        self.manifest.MarkAlreadyFilled(filledAppointments)
             
-        for appointment in appointments:
-            if appointment in filledAppointments:
-                continue
+        pending = [a for a in appointments if a not in filledAppointments and self.manifest.ShouldFill(a)]
+        for index, appointment in enumerate(pending):
+            self.metrics.SetGauge("queue_depth", len(pending) - index, queue="appointments", worker=self.workerName)
+            if self.manifest.Attempts(appointment) > 0:
+                self.metrics.Increment("retries_total", operation="fill_appointment", worker=self.workerName)
             try:
-                filledAppointments.append(self.FillAppointment(appointment))
+                with self.metrics.Time("step_duration_seconds", step="fill_appointment"):
+                    filledAppointments.append(self.FillAppointment(appointment))
             except Exception as e:
                 self.logger.error(f"Error filling appointment {appointment.petName} with Dr. {appointment.doctor} on {appointment.appointmentDate} at {appointment.appointmentTime}: {repr(e)}:{e}\n{traceback.format_exc()}")
+                self.metrics.Increment("appointments_failed_total", worker=self.workerName)
+                self.manifest.MarkAppointmentFailed(appointment, repr(e))
                 continue
+            finally:
+                self.metrics.RecordBrowserMemory(self.webDriver, self.workerName)
+            
+            # Checkpoint after every appointment so a crash only loses the one in flight
+            Utils.WriteFileAtomic(f"Complete Downloads/{saveFileName}", jsonpickle.encode(filledAppointments))
+            self.manifest.MarkAppointmentFilled(appointment)
+            self.metrics.Increment("appointments_filled_total", worker=self.workerName)
+            self.logger.info(self.manifest.ProgressReport())
         
-        with open(f"Complete Downloads/{saveFileName}", "w") as file:
-            file.write(jsonpickle.encode(filledAppointments))
+        Utils.WriteFileAtomic(f"Complete Downloads/{saveFileName}", jsonpickle.encode(filledAppointments))
+        self.metrics.SetGauge("queue_depth", 0, queue="appointments", worker=self.workerName)
+        self.manifest.MarkDayComplete(self.CurrentDate)
         
         
             
@@ -483,13 +603,83 @@ class EZVetDownloader:
 
 
 
-    def StartConversion(self):
+    def CountAppointments(self, countDate: date) -> int:
+        # Cheap density check: just count the calendar blocks without hovering over each one
+        self.awaiter.until(EC.visibility_of_element_located((By.ID, "calendar")))
+        if not self.GotoDay(countDate):
+            raise Exception(f"Could not navigate to date {countDate} in ezVet")
+        time.sleep(3)
+        # Same selector GetAppointments lists, so the count matches the work the fill step will do
+        return len(self.GetActiveTab().find_elements(By.CSS_SELECTOR, "#calendarmain > .theGrid > div.appt.hasQtip.dblClickOpen"))
+
+    def CountDay(self, day: date) -> Optional[int]:
         try:
-            while self.CurrentDate < self.EndDate:
+            with self.metrics.Time("step_duration_seconds", step="count_appointments"):
+                count = self.CountAppointments(day)
+        except Exception as e:
+            # Leave it uncounted, the scheduler will still hand it out
+            self.logger.warning(f"Worker {self.workerName}: could not count appointments on {day}: {repr(e)}")
+            return None
+        self.manifest.RecordDayCount(day, count)
+        self.logger.info(f"Counted {count} appointment(s) on {day}")
+        return count
+
+    def ProcessScheduledDays(self, scheduler: WorkScheduler):
+        while True:
+            task = scheduler.NextTask()
+            if task is None:
+                break
+            kind, day = task
+            self.metrics.SetGauge("queue_depth", scheduler.Remaining(), queue="days")
+            
+            if kind == WorkScheduler.COUNT:
+                count = None
+                try:
+                    count = self.CountDay(day)
+                finally:
+                    # Always report back, other workers may be waiting on this count
+                    scheduler.RecordCount(day, count)
+                continue
+            
+            self.CurrentDate = day
+            self.manifest.StartDay(day)
+            try:
                 self.SaveAppointmentsForCurrentDate()
-                self.CurrentDate += datetime.timedelta(days=1)
-        except BaseException as e:
-            self.logger.error(f"An exception occurred on date {self.CurrentDate}: {e}\n{traceback.format_exc()}")
+            except Exception as e:
+                # A bad day shouldn't abort the whole range, it will be retried on the next run
+                self.logger.error(f"Worker {self.workerName}: an exception occurred on date {self.CurrentDate}: {e}\n{traceback.format_exc()}")
+                self.manifest.MarkDayFailed(day, repr(e))
+            self.logger.info(self.manifest.ProgressReport())
+
+    def ProcessScheduledDaysInNewBrowser(self, scheduler: WorkScheduler):
+        try:
+            self.StartBrowser()
+        except Exception as e:
+            self.logger.error(f"Could not start worker {self.workerName}, continuing with fewer: {repr(e)}\n{traceback.format_exc()}")
+            return
+        self.ProcessScheduledDays(scheduler)
+
+    def StartConversion(self):
+        os.makedirs("In Progress Downloads", exist_ok=True)
+        os.makedirs("Complete Downloads", exist_ok=True)
+        
+        scheduler = WorkScheduler.FromManifest(self.manifest, self.manifest.RemainingDays())
+        self.logger.info(f"Scheduled {scheduler.Remaining()} day(s) with ~{scheduler.totalWork:.0f} counted appointment(s) across {self.workerCount} worker(s)")
+        
+        helpers = [EZVetDownloader(self.settingsPath, self.metrics, str(i), self.manifest) for i in range(1, self.workerCount)]
+        try:
+            with ThreadPoolExecutor(max_workers=self.workerCount) as executor:
+                # Every worker counts uncounted days first, then fills the heaviest counted days;
+                # helpers join in as soon as their browser has logged in
+                runs = [executor.submit(self.ProcessScheduledDays, scheduler)]
+                runs += [executor.submit(helper.ProcessScheduledDaysInNewBrowser, scheduler) for helper in helpers]
+                for run in runs:
+                    run.result()
+        finally:
+            self.metrics.SetGauge("queue_depth", 0, queue="days")
+            for helper in helpers:
+                if helper._webDriver is not None:
+                    helper._webDriver.quit()
             
 
 
@@ -0,0 +1,143 @@
+from typing import *
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from contextlib import contextmanager
+import threading
+import time
+
+
+# Help text for every metric we export, also fixes the order they are rendered in
+METRIC_DESCRIPTIONS = {
+    "appointments_listed_total": ("counter", "Appointments found on the calendar"),
+    "appointments_filled_total": ("counter", "Appointments fully scraped"),
+    "appointments_failed_total": ("counter", "Appointment scrapes that raised an error"),
+    "sections_skipped_total": ("counter", "Appointment sections skipped because they had nothing to scrape"),
+    "retries_total": ("counter", "Operations that had to be retried"),
+    "webdriver_calls_total": ("counter", "Commands sent to the WebDriver"),
+    "step_duration_seconds": ("histogram", "Time spent in each conversion step"),
+    "browser_memory_bytes": ("gauge", "JS heap used by each worker's browser"),
+    "queue_depth": ("gauge", "Work items still waiting to be processed"),
+}
+
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class Metrics:
+    def __init__(self, namespace: str = "crm_converter", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._values: Dict[str, Dict[Tuple, float]] = {}
+        self._histograms: Dict[str, Dict[Tuple, List[float]]] = {}
+        self._server = None
+
+    @staticmethod
+    def _LabelKey(labels: dict) -> Tuple:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def Increment(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            key = Metrics._LabelKey(labels)
+            series[key] = series.get(key, 0) + value
+
+    def SetGauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self._values.setdefault(name, {})[Metrics._LabelKey(labels)] = value
+
+    def Observe(self, name: str, value: float, **labels):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # Per-bucket counts followed by the running sum and count
+            counts = series.setdefault(Metrics._LabelKey(labels), [0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    @contextmanager
+    def Time(self, name: str, **labels):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.Observe(name, time.monotonic() - start, **labels)
+
+    def InstrumentWebDriver(self, webDriver, worker: str):
+        # Every WebDriver command funnels through execute(), so wrapping it counts them all
+        execute = webDriver.execute
+        def CountedExecute(driverCommand, params=None):
+            self.Increment("webdriver_calls_total", worker=worker, command=driverCommand)
+            return execute(driverCommand, params)
+        webDriver.execute = CountedExecute
+
+    def RecordBrowserMemory(self, webDriver, worker: str):
+        try:
+            used = webDriver.execute_script("return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null;")
+        except Exception:
+            return
+        if used is not None:
+            self.SetGauge("browser_memory_bytes", used, worker=worker)
+
+    @staticmethod
+    def _FormatLabels(key: Tuple, extra: Tuple = ()) -> str:
+        pairs = list(key) + list(extra)
+        if len(pairs) == 0:
+            return ""
+        escaped = [(k, v.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")) for k, v in pairs]
+        return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+    def Render(self) -> str:
+        lines = []
+        with self._lock:
+            names = list(METRIC_DESCRIPTIONS) + [n for n in list(self._values) + list(self._histograms) if n not in METRIC_DESCRIPTIONS]
+            for name in names:
+                metricType, description = METRIC_DESCRIPTIONS.get(name, ("untyped", name))
+                fullName = f"{self.namespace}_{name}"
+                if metricType == "histogram":
+                    series = self._histograms.get(name)
+                    if not series:
+                        continue
+                    lines.append(f"# HELP {fullName} {description}")
+                    lines.append(f"# TYPE {fullName} histogram")
+                    for key, counts in series.items():
+                        for i, bound in enumerate(self.buckets):
+                            lines.append(f"{fullName}_bucket{Metrics._FormatLabels(key, (('le', str(bound)),))} {counts[i]}")
+                        lines.append(f"{fullName}_bucket{Metrics._FormatLabels(key, (('le', '+Inf'),))} {counts[-1]}")
+                        lines.append(f"{fullName}_sum{Metrics._FormatLabels(key)} {counts[-2]}")
+                        lines.append(f"{fullName}_count{Metrics._FormatLabels(key)} {counts[-1]}")
+                else:
+                    series = self._values.get(name)
+                    if not series:
+                        continue
+                    lines.append(f"# HELP {fullName} {description}")
+                    lines.append(f"# TYPE {fullName} {metricType}")
+                    for key, value in series.items():
+                        lines.append(f"{fullName}{Metrics._FormatLabels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def StartServer(self, port: int, host: str = "127.0.0.1"):
+        metrics = self
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.Render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            def log_message(self, format, *args):
+                # Keep scrapes out of stderr
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True).start()
+
+    def StopServer(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
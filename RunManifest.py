@@ -0,0 +1,240 @@
+from typing import *
+from datetime import date, datetime, timedelta
+import json
+import os
+import threading
+import time
+
+# Local Imports
+from AppointmentModel import AppointmentModel
+from Utils import Utils
+
+
+class DayState:
+    PENDING = "pending"
+    LISTED = "listed"
+    COMPLETE = "complete"
+    FAILED = "failed"
+
+class AppointmentState:
+    LISTED = "listed"
+    FILLED = "filled"
+    FAILED = "failed"
+
+
+class RunManifest:
+    def __init__(self, path: str, startDate: date, endDate: date, maxAttempts: int = 3):
+        self.path = path
+        self.maxAttempts = maxAttempts
+        self.days: Dict[str, dict] = {}
+        # Shared by every worker, so all reads and writes of days go through this lock
+        self._lock = threading.RLock()
+
+        # Resume from the last checkpoint if one exists
+        if os.path.exists(self.path):
+            with open(self.path, "r") as file:
+                self.days = json.load(file)["days"]
+
+        # Extend the manifest with any days that were not part of a previous run
+        currentDate = startDate
+        while currentDate < endDate:
+            self.days.setdefault(RunManifest.DayKey(currentDate), {
+                "state": DayState.PENDING,
+                "attempts": 0,
+                "error": None,
+                "count": None,
+                "appointments": {},
+            })
+            currentDate += timedelta(days=1)
+        self.startDate = startDate
+        self.endDate = endDate
+
+        # Throughput is measured for this session only so resumed runs don't skew the ETA
+        self.sessionStart = time.monotonic()
+        self.sessionFilled = 0
+
+    @staticmethod
+    def DayKey(day: date) -> str:
+        return day.strftime("%Y-%m-%d")
+
+    @staticmethod
+    def AppointmentKey(appointment: AppointmentModel) -> str:
+        # Same fields AppointmentModel uses for equality
+        return f"{appointment.appointmentDate} {appointment.appointmentTime} {appointment.clientName} {appointment.petName}"
+
+    def Checkpoint(self):
+        with self._lock:
+            Utils.WriteFileAtomic(self.path, json.dumps({
+                "startDate": RunManifest.DayKey(self.startDate),
+                "endDate": RunManifest.DayKey(self.endDate),
+                "updated": datetime.now().isoformat(timespec="seconds"),
+                "days": self.days,
+            }, indent=2))
+
+    def _DaysInRange(self) -> List[Tuple[date, dict]]:
+        # Days kept from an earlier run with a wider range are left alone
+        days = []
+        for key, day in sorted(self.days.items()):
+            dayDate = datetime.strptime(key, "%Y-%m-%d").date()
+            if self.startDate <= dayDate < self.endDate:
+                days.append((dayDate, day))
+        return days
+
+    def _Retryable(self, day: dict) -> List[dict]:
+        return [a for a in day["appointments"].values() if a["state"] != AppointmentState.FILLED and a["attempts"] < self.maxAttempts]
+
+    def RemainingDays(self) -> List[date]:
+        with self._lock:
+            remaining = []
+            for dayDate, day in self._DaysInRange():
+                if day["state"] == DayState.COMPLETE:
+                    continue
+                # Day attempts only give up on the day once none of its appointments can be retried either
+                if day["state"] == DayState.FAILED and day["attempts"] >= self.maxAttempts and len(self._Retryable(day)) == 0:
+                    continue
+                remaining.append(dayDate)
+            return remaining
+
+    def StartDay(self, day: date):
+        with self._lock:
+            entry = self.days[RunManifest.DayKey(day)]
+            entry["attempts"] += 1
+            self.Checkpoint()
+
+    def MarkDayListed(self, day: date, appointments: List[AppointmentModel]):
+        with self._lock:
+            entry = self.days[RunManifest.DayKey(day)]
+            entry["state"] = DayState.LISTED
+            for appointment in appointments:
+                entry["appointments"].setdefault(RunManifest.AppointmentKey(appointment), {
+                    "state": AppointmentState.LISTED,
+                    "attempts": 0,
+                    "error": None,
+                })
+            self.Checkpoint()
+
+    def MarkDayComplete(self, day: date):
+        with self._lock:
+            entry = self.days[RunManifest.DayKey(day)]
+            retryable = self._Retryable(entry)
+            # Leave the day open while any appointment still has attempts left
+            if len(retryable) > 0:
+                entry["state"] = DayState.FAILED
+                entry["error"] = f"{len(retryable)} appointment(s) not filled"
+            else:
+                entry["state"] = DayState.COMPLETE
+                entry["error"] = None
+            self.Checkpoint()
+
+    def MarkDayFailed(self, day: date, error: str):
+        with self._lock:
+            entry = self.days[RunManifest.DayKey(day)]
+            entry["state"] = DayState.FAILED
+            entry["error"] = error
+            self.Checkpoint()
+
+    def RecordDayCount(self, day: date, count: int):
+        with self._lock:
+            entry = self.days[RunManifest.DayKey(day)]
+            entry["count"] = count
+            # Nothing on the calendar (weekends, holidays) so there's nothing to list or fill
+            if count == 0:
+                entry["state"] = DayState.COMPLETE
+                entry["error"] = None
+            self.Checkpoint()
+
+    def RemainingWork(self, day: date) -> Optional[int]:
+        with self._lock:
+            entry = self.days[RunManifest.DayKey(day)]
+            if entry["state"] != DayState.PENDING and len(entry["appointments"]) > 0:
+                return sum(1 for a in entry["appointments"].values() if a["state"] != AppointmentState.FILLED)
+            return entry.get("count")
+
+    def ShouldFill(self, appointment: AppointmentModel) -> bool:
+        with self._lock:
+            entry = self.days[RunManifest.DayKey(appointment.appointmentDate)]["appointments"].get(RunManifest.AppointmentKey(appointment))
+            if entry is None:
+                return True
+            if entry["state"] == AppointmentState.FILLED:
+                return False
+            return entry["attempts"] < self.maxAttempts
+
+    def Attempts(self, appointment: AppointmentModel) -> int:
+        with self._lock:
+            entry = self.days[RunManifest.DayKey(appointment.appointmentDate)]["appointments"].get(RunManifest.AppointmentKey(appointment))
+            return 0 if entry is None else entry["attempts"]
+
+    def _AppointmentEntry(self, appointment: AppointmentModel) -> dict:
+        return self.days[RunManifest.DayKey(appointment.appointmentDate)]["appointments"].setdefault(RunManifest.AppointmentKey(appointment), {
+            "state": AppointmentState.LISTED,
+            "attempts": 0,
+            "error": None,
+        })
+
+    def MarkAppointmentFilled(self, appointment: AppointmentModel):
+        with self._lock:
+            entry = self._AppointmentEntry(appointment)
+            entry["state"] = AppointmentState.FILLED
+            entry["attempts"] += 1
+            entry["error"] = None
+            self.sessionFilled += 1
+            self.Checkpoint()
+
+    def MarkAlreadyFilled(self, appointments: List[AppointmentModel]):
+        # Appointments found in the download archive (written before a crash, or by a run from before
+        # the manifest existed) are filled but weren't scraped this session, so they don't count toward throughput
+        with self._lock:
+            for appointment in appointments:
+                entry = self._AppointmentEntry(appointment)
+                entry["state"] = AppointmentState.FILLED
+                entry["error"] = None
+            self.Checkpoint()
+
+    def MarkAppointmentFailed(self, appointment: AppointmentModel, error: str):
+        with self._lock:
+            entry = self._AppointmentEntry(appointment)
+            entry["state"] = AppointmentState.FAILED
+            entry["attempts"] += 1
+            entry["error"] = error
+            self.Checkpoint()
+
+    def Counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {"days": 0, "daysComplete": 0, "daysFailed": 0, "daysListed": 0, "daysCounted": 0, "counted": 0, "listed": 0, "filled": 0, "failed": 0, "retried": 0, "toFill": 0}
+            for _, day in self._DaysInRange():
+                counts["days"] += 1
+                if day["state"] == DayState.COMPLETE:
+                    counts["daysComplete"] += 1
+                elif day["state"] == DayState.FAILED:
+                    counts["daysFailed"] += 1
+                if day["state"] in (DayState.LISTED, DayState.COMPLETE) or day["appointments"]:
+                    counts["daysListed"] += 1
+                elif day.get("count") is not None:
+                    # Counted by the scheduler but not listed yet
+                    counts["daysCounted"] += 1
+                    counts["counted"] += day["count"]
+                for appointment in day["appointments"].values():
+                    counts["listed"] += 1
+                    if appointment["state"] == AppointmentState.FILLED:
+                        counts["filled"] += 1
+                    elif appointment["state"] == AppointmentState.FAILED:
+                        counts["failed"] += 1
+                    if appointment["attempts"] > 1:
+                        counts["retried"] += 1
+                counts["toFill"] += len(self._Retryable(day))
+            return counts
+
+    def ProgressReport(self) -> str:
+        counts = self.Counts()
+        elapsed = time.monotonic() - self.sessionStart
+        throughput = self.sessionFilled / elapsed * 3600 if elapsed > 0 else 0
+
+        # Estimate unlisted days from the average density of the days listed so far
+        averagePerDay = counts["listed"] / counts["daysListed"] if counts["daysListed"] > 0 else 0
+        # Appointments that have used up their attempts will never be tried again, so they aren't remaining work
+        remaining = counts["toFill"] + counts["counted"] + averagePerDay * (counts["days"] - counts["daysListed"] - counts["daysCounted"])
+        eta = timedelta(seconds=int(remaining / throughput * 3600)) if throughput > 0 else "unknown"
+
+        return (f"Days {counts['daysComplete']}/{counts['days']} complete ({counts['daysFailed']} failed), "
+                f"appointments {counts['filled']}/{counts['listed']} filled ({counts['failed']} failed, {counts['retried']} retried), "
+                f"{throughput:.1f} appointments/hour, ~{int(remaining)} remaining, ETA {eta}")
@@ -0,0 +1,42 @@
+from typing import *
+
+
+# Row selectors for every subsection we scrape, keyed by the names used in settings.json 'sections'
+SECTION_ROWS = {
+    # Clinical Exam
+    "masterProblems": "div.medications > div > div > div.inputSection > div.inputSectionContent > div.animalMasterProblemList > table > tr",
+    "healthStatus": "div.HealthStatus_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div > table > tbody > tr",
+    "history": "div.VisitHistory_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div > table > tbody > tr",
+    "physicalExam": "div.VisitExam_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div.VisitExamList > table > tbody > tr",
+    "assessment": "div.ConsultAssessment_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div.ConsultAssessmentList > table > tbody > tr",
+    "plan": "div.ConsultPlan_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div.ConsultPlanList > table > tbody > tr",
+    # Diagnostics & Treatments
+    "medications": "div.Medications_subSectionContent > div:first-child > div:first-child > div:first-child > div.inputSection > div.inputSectionContent > div.MedicationList > table > tbody > tr",
+    "therapeuticProcedures": "div.Therapeutics_subSectionContent > div:first-child > div.inputSection > div.inputSectionContent > div.planTherapeuticsList > table > tbody > tr",
+    "diagnosticResults": "div.DiagnosticResults_subSectionContent > div:first-child > div.hasJaxRequest > div:nth-child(2) > div.inputSection > div.inputSectionContent > div.diagnosticResultsList > table > tbody > tr",
+}
+CLINICAL_EXAM_SECTIONS = ["masterProblems", "healthStatus", "history", "physicalExam", "assessment", "plan"]
+DIAGNOSTICS_AND_TREATMENTS_SECTIONS = ["medications", "therapeuticProcedures", "diagnosticResults"]
+
+# Element that has to be visible before a section's rows can be trusted, the same ones FillClinicalExamInfo
+# and FillDiagnosticAndTreatmentInfo wait for. Until then an empty list may just mean it's still loading
+SECTION_READY_MARKERS = {
+    **{section: "div.animalMasterProblemList" for section in CLINICAL_EXAM_SECTIONS},
+    **{section: "div.Medications_subSectionContent" for section in DIAGNOSTICS_AND_TREATMENTS_SECTIONS},
+}
+
+
+def ParseSections(value: Optional[Iterable[str]], settingsPath: str) -> Set[str]:
+    # Only scrape the subsections the import needs, everything by default
+    sections = set(value if value is not None else SECTION_ROWS.keys())
+    unknownSections = sections - SECTION_ROWS.keys()
+    if len(unknownSections) > 0:
+        raise Exception(f"Unknown sections in {settingsPath}: {', '.join(sorted(unknownSections))}")
+    return sections
+
+def ShouldScrape(section: str, sections: Set[str], sectionRows: Dict[str, Optional[List[int]]]) -> bool:
+    if section not in sections:
+        return False
+    # None means the rows couldn't be read yet, so the section has to be loaded to find out
+    rows = sectionRows.get(section)
+    return rows is None or len(rows) > 0
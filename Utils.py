@@ -1,16 +1,18 @@
 import decimal
+import os
 import time
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support import expected_conditions as EC
 
 class Utils:
     @staticmethod
     def ForceClick(window, element):
+        # Selenium is imported on use so file helpers stay cheap to import
+        from selenium.webdriver.common.action_chains import ActionChains
         actions = ActionChains(window)
         actions.move_to_element(element).click().perform()
 
     @staticmethod
     def ScrollToElement(window, by, value):
+        from selenium.webdriver.support import expected_conditions as EC
         currentScroll = 0
         while EC.visibility_of_element_located((by, value)) == False and currentScroll < 10000:
             window.execute_script(f"document.querySelector('{value}').scrollTo(0, {currentScroll});")
@@ -24,6 +26,7 @@ class Utils:
 
     @staticmethod
     def HoverOverElement(window, element):
+        from selenium.webdriver.common.action_chains import ActionChains
         actions = ActionChains(window)
         actions.move_to_element(element).perform()
 
@@ -64,6 +67,16 @@ class Utils:
         raise Exception("Could not build CSS selector")
     
     
+    @staticmethod
+    def WriteFileAtomic(path: str, text: str):
+        # Write to a sibling temp file and swap it in so a crash never leaves a half-written file
+        tempPath = f"{path}.tmp"
+        with open(tempPath, "w") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tempPath, path)
+
     @staticmethod
     def TryParse(parseString  : str, parseType : type):
         try:
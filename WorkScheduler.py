@@ -0,0 +1,70 @@
+from typing import *
+from datetime import date
+import threading
+
+# Local Imports
+from RunManifest import RunManifest
+
+
+class WorkScheduler:
+    COUNT = "count"
+    FILL = "fill"
+
+    def __init__(self, dayCounts: Dict[date, Optional[int]]):
+        self._condition = threading.Condition()
+        self._counting = 0
+
+        # Days without a count are counted first, spread across every worker
+        self._toCount = sorted(day for day, count in dayCounts.items() if count is None)
+        self.weights = {day: count for day, count in dayCounts.items() if count is not None}
+
+        # Heaviest days first: workers pull from the front, so the long days start early and the
+        # short ones fill in the gaps at the end (longest-processing-time-first)
+        self._queue = sorted((day for day, weight in self.weights.items() if weight > 0), key=lambda day: (-self.weights[day], day))
+
+    @staticmethod
+    def FromManifest(manifest: RunManifest, days: List[date]):
+        dayCounts = {}
+        for day in days:
+            work = manifest.RemainingWork(day)
+            if work == 0:
+                # Every appointment was filled but the run stopped before the day was closed out
+                manifest.MarkDayComplete(day)
+                continue
+            dayCounts[day] = work
+        return WorkScheduler(dayCounts)
+
+    @property
+    def totalWork(self) -> float:
+        with self._condition:
+            return sum(self.weights.values())
+
+    def NextTask(self) -> Optional[Tuple[str, date]]:
+        with self._condition:
+            while True:
+                if len(self._toCount) > 0:
+                    self._counting += 1
+                    return (WorkScheduler.COUNT, self._toCount.pop(0))
+                if len(self._queue) > 0:
+                    return (WorkScheduler.FILL, self._queue.pop(0))
+                # Another worker may still be counting a day that's about to be queued
+                if self._counting == 0:
+                    return None
+                self._condition.wait()
+
+    def RecordCount(self, day: date, count: Optional[int]):
+        with self._condition:
+            self._counting -= 1
+            if count is None:
+                # Couldn't be counted, assume it's about average so it still gets handed out
+                known = list(self.weights.values())
+                count = sum(known) / len(known) if len(known) > 0 else 1
+            self.weights[day] = count
+            if count > 0:
+                self._queue.append(day)
+                self._queue.sort(key=lambda queued: (-self.weights[queued], queued))
+            self._condition.notify_all()
+
+    def Remaining(self) -> int:
+        with self._condition:
+            return len(self._toCount) + len(self._queue)
@@ -0,0 +1,16 @@
+from datetime import date, time
+import pytest
+
+from AppointmentModel import AppointmentModel
+
+
+@pytest.fixture
+def makeAppointment():
+    def MakeAppointment(day: date, hour: int, petName: str) -> AppointmentModel:
+        appointment = AppointmentModel()
+        appointment.appointmentDate = day
+        appointment.appointmentTime = time(hour, 0)
+        appointment.clientName = "Jane Doe"
+        appointment.petName = petName
+        return appointment
+    return MakeAppointment
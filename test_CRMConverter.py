@@ -0,0 +1,79 @@
+from datetime import date
+import json
+import os
+import sys
+
+import jsonpickle
+import pytest
+
+from CRMConverter import Main
+from RunManifest import RunManifest
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch, makeAppointment):
+    # Download folders and the manifest are relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    with open("settings.json", "w") as file:
+        json.dump({"startDate": "2024-03-04", "endDate": "2024-03-06", "manifestPath": "manifest.json"}, file)
+
+    day = date(2024, 3, 4)
+    filled = makeAppointment(day, 9, "Rex")
+    filled.doctor = "Smith"
+    filled.type = "Exam"
+    filled.cssPath = "#appt1"
+    filled.weight = 12.5
+    missing = makeAppointment(day, 10, "Tom")
+
+    os.makedirs("In Progress Downloads")
+    os.makedirs("Complete Downloads")
+    with open("In Progress Downloads/2024-03-04 Download.json", "w") as file:
+        file.write(jsonpickle.encode([filled, missing]))
+    with open("Complete Downloads/2024-03-04 Download.json", "w") as file:
+        file.write(jsonpickle.encode([filled]))
+
+    manifest = RunManifest("manifest.json", day, date(2024, 3, 6))
+    manifest.StartDay(day)
+    manifest.MarkDayListed(day, [filled, missing])
+    manifest.MarkAppointmentFilled(filled)
+    manifest.MarkAppointmentFailed(missing, "boom")
+    return tmp_path
+
+
+def test_export_csv(archive, capsys):
+    assert Main(["export"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("appointmentDate,appointmentTime,clientName,petName")
+    assert lines[1].startswith("2024-03-04,09:00:00,Jane Doe,Rex,Smith,Exam")
+    assert len(lines) == 2
+
+
+def test_export_json_to_file(archive):
+    assert Main(["export", "--format", "json", "--output", "export.json"]) == 0
+    with open("export.json") as file:
+        exported = json.load(file)
+    assert len(exported) == 1
+    assert exported[0]["petName"] == "Rex"
+    assert exported[0]["appointmentDate"] == "2024-03-04"
+    assert exported[0]["weight"] == 12.5
+
+
+def test_verify_reports_unfilled_appointments(archive, capsys):
+    assert Main(["verify"]) == 1
+    output = capsys.readouterr().out
+    assert "Tom at 10:00:00 was listed but never filled" in output
+    assert "Rex" not in output
+
+
+def test_stats(archive, capsys):
+    assert Main(["stats"]) == 0
+    output = capsys.readouterr().out
+    assert "Days:          0/2 complete, 0 failed" in output
+    assert "Appointments:  1/2 filled, 1 failed, 0 retried" in output
+    assert "Remaining:     2 day(s)" in output
+
+
+def test_archive_commands_do_not_load_selenium(archive):
+    Main(["stats"])
+    Main(["export", "--output", "export.csv"])
+    assert not any(module.startswith("selenium") for module in sys.modules)
@@ -0,0 +1,27 @@
+from Metrics import Metrics
+
+
+def test_render_prometheus_text():
+    metrics = Metrics(buckets=(0.5, 1))
+    metrics.Increment("retries_total", operation="goto_day", worker="0")
+    metrics.Increment("retries_total", operation="goto_day", worker="0")
+    metrics.SetGauge("queue_depth", 3, queue="days")
+    metrics.Observe("step_duration_seconds", 0.75, step="fill_appointment")
+    metrics.Increment("appointments_failed_total", worker='a"b\\c\nd')
+
+    lines = metrics.Render().splitlines()
+
+    assert "# TYPE crm_converter_retries_total counter" in lines
+    assert 'crm_converter_retries_total{operation="goto_day",worker="0"} 2' in lines
+    assert 'crm_converter_queue_depth{queue="days"} 3' in lines
+    # Buckets are cumulative and end with +Inf
+    assert "# TYPE crm_converter_step_duration_seconds histogram" in lines
+    assert 'crm_converter_step_duration_seconds_bucket{step="fill_appointment",le="0.5"} 0' in lines
+    assert 'crm_converter_step_duration_seconds_bucket{step="fill_appointment",le="1"} 1' in lines
+    assert 'crm_converter_step_duration_seconds_bucket{step="fill_appointment",le="+Inf"} 1' in lines
+    assert 'crm_converter_step_duration_seconds_sum{step="fill_appointment"} 0.75' in lines
+    assert 'crm_converter_step_duration_seconds_count{step="fill_appointment"} 1' in lines
+    # Label values are escaped
+    assert 'crm_converter_appointments_failed_total{worker="a\\"b\\\\c\\nd"} 1' in lines
+    # Metrics that were never recorded aren't rendered
+    assert not any("webdriver_calls_total" in line for line in lines)
@@ -0,0 +1,72 @@
+from datetime import date
+
+from RunManifest import RunManifest, DayState, AppointmentState
+
+
+def test_archived_appointments_complete_the_day_on_resume(tmp_path, makeAppointment):
+    day = date(2024, 3, 4)
+    manifest = RunManifest(str(tmp_path / "manifest.json"), day, date(2024, 3, 5))
+    appointments = [makeAppointment(day, 9, "Rex"), makeAppointment(day, 10, "Tom")]
+
+    # Both appointments are already in Complete Downloads, but the manifest never heard about them
+    manifest.StartDay(day)
+    manifest.MarkDayListed(day, appointments)
+    manifest.MarkAlreadyFilled(appointments)
+    manifest.MarkDayComplete(day)
+
+    assert manifest.days["2024-03-04"]["state"] == DayState.COMPLETE
+    assert all(a["state"] == AppointmentState.FILLED for a in manifest.days["2024-03-04"]["appointments"].values())
+    assert manifest.sessionFilled == 0
+    assert manifest.RemainingDays() == []
+
+
+def test_checkpoint_resumes_from_disk(tmp_path, makeAppointment):
+    day = date(2024, 3, 4)
+    path = str(tmp_path / "manifest.json")
+    manifest = RunManifest(path, day, date(2024, 3, 6))
+    appointment = makeAppointment(day, 9, "Rex")
+    manifest.MarkDayListed(day, [appointment])
+    manifest.MarkAppointmentFailed(appointment, "boom")
+
+    resumed = RunManifest(path, day, date(2024, 3, 6))
+    assert resumed.Attempts(appointment) == 1
+    assert resumed.ShouldFill(appointment)
+    assert resumed.RemainingDays() == [day, date(2024, 3, 5)]
+
+
+def test_day_stays_open_while_an_appointment_can_be_retried(tmp_path, makeAppointment):
+    day = date(2024, 3, 4)
+    manifest = RunManifest(str(tmp_path / "manifest.json"), day, date(2024, 3, 5))
+    appointment = makeAppointment(day, 9, "Rex")
+
+    # Two runs fail while listing, the third lists the day and the appointment fails once
+    for _ in range(2):
+        manifest.StartDay(day)
+        manifest.MarkDayFailed(day, "timeout")
+    manifest.StartDay(day)
+    manifest.MarkDayListed(day, [appointment])
+    manifest.MarkAppointmentFailed(appointment, "boom")
+    manifest.MarkDayComplete(day)
+
+    assert manifest.days["2024-03-04"]["state"] == DayState.FAILED
+    assert manifest.ShouldFill(appointment)
+    assert manifest.RemainingDays() == [day]
+
+
+def test_counts_ignore_days_outside_range_and_exhausted_appointments(tmp_path, makeAppointment):
+    path = str(tmp_path / "manifest.json")
+    wide = RunManifest(path, date(2024, 3, 1), date(2024, 3, 10), maxAttempts=1)
+    wide.MarkDayListed(date(2024, 3, 1), [makeAppointment(date(2024, 3, 1), 9, "Old")])
+    wide.Checkpoint()
+
+    manifest = RunManifest(path, date(2024, 3, 4), date(2024, 3, 5), maxAttempts=1)
+    appointment = makeAppointment(date(2024, 3, 4), 9, "Rex")
+    manifest.MarkDayListed(date(2024, 3, 4), [appointment])
+    manifest.MarkAppointmentFailed(appointment, "boom")
+    manifest.MarkDayComplete(date(2024, 3, 4))
+
+    counts = manifest.Counts()
+    assert counts["days"] == 1
+    assert counts["listed"] == 1
+    assert counts["toFill"] == 0
+    assert "~0 remaining" in manifest.ProgressReport()
@@ -0,0 +1,26 @@
+import pytest
+
+from Sections import SECTION_ROWS, ParseSections, ShouldScrape
+
+
+def test_parse_sections_defaults_to_everything():
+    assert ParseSections(None, "settings.json") == set(SECTION_ROWS.keys())
+    assert ParseSections(["medications", "plan"], "settings.json") == {"medications", "plan"}
+
+
+def test_parse_sections_rejects_unknown_names():
+    with pytest.raises(Exception, match="vaccines"):
+        ParseSections(["medications", "vaccines"], "settings.json")
+
+
+def test_should_scrape():
+    sections = {"medications", "plan"}
+    sectionRows = {"medications": [], "plan": None, "history": [0, 2]}
+
+    # Empty once rendered is skipped, not rendered yet has to be loaded
+    assert not ShouldScrape("medications", sections, sectionRows)
+    assert ShouldScrape("plan", sections, sectionRows)
+    assert ShouldScrape("plan", sections, {})
+    # Rows with data are skipped anyway when the section isn't selected
+    assert not ShouldScrape("history", sections, sectionRows)
+    assert ShouldScrape("history", {"history"}, sectionRows)
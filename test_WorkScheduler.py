@@ -0,0 +1,35 @@
+from datetime import date
+
+from RunManifest import RunManifest, DayState
+from WorkScheduler import WorkScheduler
+
+
+def test_fully_filled_listed_day_is_closed_out(tmp_path, makeAppointment):
+    day = date(2024, 3, 4)
+    manifest = RunManifest(str(tmp_path / "manifest.json"), day, date(2024, 3, 5))
+    appointment = makeAppointment(day, 9, "Rex")
+
+    # Crashed after the last appointment was filled but before MarkDayComplete
+    manifest.StartDay(day)
+    manifest.MarkDayListed(day, [appointment])
+    manifest.MarkAppointmentFilled(appointment)
+    assert manifest.RemainingWork(day) == 0
+
+    scheduler = WorkScheduler.FromManifest(manifest, manifest.RemainingDays())
+    assert scheduler.NextTask() is None
+    assert manifest.days["2024-03-04"]["state"] == DayState.COMPLETE
+    assert manifest.RemainingDays() == []
+
+
+def test_counts_first_then_heaviest_days():
+    scheduler = WorkScheduler({date(2024, 3, 4): 2, date(2024, 3, 5): None, date(2024, 3, 6): 7, date(2024, 3, 7): None})
+
+    assert scheduler.NextTask() == (WorkScheduler.COUNT, date(2024, 3, 5))
+    assert scheduler.NextTask() == (WorkScheduler.COUNT, date(2024, 3, 7))
+    scheduler.RecordCount(date(2024, 3, 5), 0)
+    scheduler.RecordCount(date(2024, 3, 7), 4)
+
+    assert scheduler.NextTask() == (WorkScheduler.FILL, date(2024, 3, 6))
+    assert scheduler.NextTask() == (WorkScheduler.FILL, date(2024, 3, 7))
+    assert scheduler.NextTask() == (WorkScheduler.FILL, date(2024, 3, 4))
+    assert scheduler.NextTask() is None